@@ -7,7 +7,9 @@
 # Import QT modules
 from PyQt6.QtWidgets import QApplication, QMainWindow, QSplitter, QTreeView, QFrame, QVBoxLayout, QScrollArea
 from PyQt6.QtGui import QStandardItemModel, QStandardItem, QFont
-from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtCore import Qt
+from matplotlib.ticker import FuncFormatter
+from datetime import datetime
 import sys
 
 # Import local modules
@@ -59,7 +61,8 @@ class MainWindow(QMainWindow):
         super(MainWindow,self).__init__(parent)
         # Create panels
         self.pinger=QPinger()
-        self.trend=QStyledPlot('Ping Trend','Measurement time','Response time (ms)')
+        xfmt=FuncFormatter(lambda value,pos: datetime.fromtimestamp(value).strftime('%H:%M:%S'))
+        self.trend=QStyledPlot('Ping Trend','Measurement time','Response time (ms)',xfmt=xfmt,mplstyle=self.pinger.mplstyle)
         self.log=QLog()
         self.frames=[]
         self.frames.append(Frame(self.pinger,'Config'))
@@ -86,11 +89,12 @@ class MainWindow(QMainWindow):
         index=treemodel.indexFromItem(self.frames[0].item)
         self.treeview.setCurrentIndex(index)
         self.frames[0].object.setVisible(True)
+        self.visibleframe=self.frames[0]
 
-        # Use a timer to process data from the queue
-        self.timer=QTimer()
-        self.timer.timeout.connect(self.Process)
-        self.timer.start(100)
+        # React to published samples, log messages and style changes as they occur
+        self.pinger.sampleReady.connect(self.PlotSample)
+        self.pinger.styleUpdated.connect(self.StyleChanged)
+        self.log.updated.connect(self.log.updateLog)
 
         # Show window
         layout=QVBoxLayout()
@@ -113,7 +117,7 @@ class MainWindow(QMainWindow):
     ##\brief Stop background processes upon terminating the application
     # \param event Not used
     def closeEvent(self, event):
-        #self.timer.stop()
+        self.pinger.shutdown()
         super().close()
 
     ##\brief Respond to user clicking on the treeview
@@ -122,21 +126,25 @@ class MainWindow(QMainWindow):
         # Show/hide dynamic panels
         title=Value.data()
         for frame in self.frames:
-            frame.object.setVisible(title==frame.label)
-
-    ##\brief Timer event to update plots
-    def Process(self):
-        # Update pinger
-        xdata,ydata,legend=self.pinger.updatePing()
-
-        # Update plot
-        if self.trend.mplstyle!=self.pinger.ctrl_style.combo.currentText():
-            self.trend.setStyle(self.pinger.ctrl_style.combo.currentText())
-        if xdata!=None:
-            self.trend.plotXY(xdata,ydata,legend)
-
-        # Update logger
-        self.log.updateLog()
+            if title==frame.label and frame!=self.visibleframe:
+                self.visibleframe.object.setVisible(False)
+                frame.object.setVisible(True)
+                self.visibleframe=frame
+
+    ##\brief Plots a sample batch published by the pinger
+    # \param xdata Dataset for x-axis
+    # \param ydata Dataset for y-axis
+    # \param legend List of legend entries
+    def PlotSample(self,xdata,ydata,legend):
+        self.trend.updateXY(xdata,ydata,legend)
+
+    ##\brief Reloads the plot when the user selects another style
+    # \param style Name of the selected style
+    def StyleChanged(self,style):
+        with PlotUpdateGuard(self.trend):
+            self.trend.setStyle(style)
+            if self.pinger.xdata is not None:
+                self.trend.updateXY(self.pinger.xdata,self.pinger.ydata,self.pinger.legend)
 
 # Start application
 if __name__ == "__main__":
@@ -5,8 +5,9 @@
 #
 from PyQt6.QtWidgets import QHBoxLayout, QVBoxLayout, QMessageBox, QFrame, QFileDialog, QListWidget, QComboBox, QPushButton
 from PyQt6.QtGui import QFont
-from PyQt6.QtCore import QTimer
-import logging,datetime
+from PyQt6.QtCore import QTimer,pyqtSignal
+from collections import deque
+import logging,time
 
 
 ##\class LogHandler
@@ -15,9 +16,6 @@ class LogHandler(logging.Handler):
     ## Reference to the output object (Falls back to print())
     output=None
 
-    ## Effective log level to display
-    level=logging.INFO
-
     ##\brief Initializes handler
     def __init__(self):
         super().__init__()
@@ -26,17 +24,19 @@ class LogHandler(logging.Handler):
     ##\brief Handle output
     # \param record Log record to handle
     def emit(self, record):
-        if record.levelno>=LogHandler.level:
-            if LogHandler.output:
-                LogHandler.output.processLog(record)
-            else:
-                t=datetime.datetime.now().strftime('%c')
-                msg='%s  %-*s %s' % (t,8,record.levelname,record.msg)
-                print(msg)
+        t=time.strftime('%c',time.localtime(record.created))
+        msg=record.getMessage()
+        s=f'{t}  {record.levelname:<8} {msg}'
+        if LogHandler.output:
+            LogHandler.output.processLog(record.levelno,record.module,msg,s)
+        else:
+            print(s)
 
 ##\class QLog
 # \brief Frame to display realtime log output
 class QLog(QFrame):
+    ## Signal emitted when new messages are pending (Queued across threads)
+    updated=pyqtSignal()
     ##\brief Constructor sets up frame layout
     def __init__(self):
         super().__init__()
@@ -47,13 +47,20 @@ class QLog(QFrame):
         self.clearbutton.clicked.connect(self.clear)
         self.savebutton=QPushButton('Save log to file')
         self.savebutton.clicked.connect(self.saveLog)
-        self.messages=[]
+        self.messages=deque(maxlen=5000)
+        self.pending=deque()
         self.msgbox=True
+        self.errorbox=QMessageBox(self)
+        self.errorbox.setIcon(QMessageBox.Icon.Critical)
+        self.errorbox.setModal(False)
+        self.errorcount=0
+        self.errortime=0
 
         # Manage loglevels
         levels=['CRITICAL','ERROR','WARNING','INFO','DEBUG']
         level=3
-        for i in range(len(levels)): self.dropdown.addItem(levels[i])
+        self.handler=LogHandler()
+        for name in levels: self.dropdown.addItem(name)
         self.dropdown.currentIndexChanged.connect(self.currentIndexChanged)
         self.dropdown.setCurrentIndex(level)
 
@@ -67,8 +74,7 @@ class QLog(QFrame):
         self.setLayout(layout)
 
         # Enable logging
-        logging.basicConfig(level=logging.DEBUG,handlers=[LogHandler()])
-        LogHandler.level=logging._nameToLevel['INFO']
+        logging.basicConfig(handlers=[self.handler])
         LogHandler.output=self
 
     ##\brief Called when loglevel has changed
@@ -76,16 +82,23 @@ class QLog(QFrame):
     def currentIndexChanged(self,index):
         levelname=self.dropdown.itemText(index)
         level=logging._nameToLevel[levelname]
-        LogHandler.level=level
+        self.handler.setLevel(level)
+        logging.getLogger().setLevel(level)
 
     ##\brief Clear existing log
     def clear(self):
-        self.messages=[]
+        self.messages.clear()
+        self.pending.clear()
         self.listbox.clear()
 
-    ##\brief Process messages from logger
-    def processLog(self,message):
-        self.messages.append(message)
+    ##\brief Process a pre-formatted message from the logger
+    # \param levelno Numeric loglevel of the message
+    # \param module Name of the module issuing the message
+    # \param msg Message text without timestamp/level decoration
+    # \param s Fully formatted message string
+    def processLog(self,levelno,module,msg,s):
+        self.pending.append((levelno,module,msg,s))
+        self.updated.emit()
 
     ##\brief Manually adds a text string
     # \param text Text string to add
@@ -94,14 +107,10 @@ class QLog(QFrame):
 
     ##\brief Saves log output to file
     def saveLog(self):
-        text=''
-        for message in self.messages:
-            text+=message+'\n'
         filename, _ = QFileDialog.getSaveFileName(self,'Save process log','mbserver.log','Log files(*.log);;All Files(*.*)',options=QFileDialog.Options())
         if filename:
             with open(filename, 'w') as f:
-                f.write(text)
-                f.close()
+                f.writelines(message+'\n' for message in self.messages)
 
     ##\brief Show errors in a messagebox
     # \param show True to display messagebox for error messages
@@ -110,15 +119,41 @@ class QLog(QFrame):
     def showMessagebox(self,show):
         self.msgbox=show
 
+    ##\brief Presents an error without blocking the event loop
+    # \param module Name of the module issuing the error
+    # \param msg Error message to display
+    #
+    # Repeated errors are coalesced into the open messagebox, and at most one
+    # new messagebox is raised every 5 seconds.
+    def showError(self,module,msg):
+        if self.errorbox.isVisible():
+            self.errorcount+=1
+            self.errorbox.setText(msg+'\n\n('+str(self.errorcount)+' errors reported)')
+        elif time.monotonic()-self.errortime>=5:
+            self.errorcount=1
+            self.errortime=time.monotonic()
+            self.errorbox.setWindowTitle(module)
+            self.errorbox.setText(msg)
+            self.errorbox.show()
+
     ##\brief Updates GUI with added messages
     def updateLog(self):
-        messages=self.messages
-        self.messages=[]
-        for message in messages:
-            if self.msgbox and (message.levelno==logging.ERROR or message.levelno==logging.CRITICAL):
-                QMessageBox.critical(self,message.module,str(message.msg))
-            s='%s  %-*s %s' % (datetime.datetime.now().strftime('%c'),8,message.levelname,message.msg)
-            self.listbox.addItem(s)
-        if len(messages):
+        # Drain pending messages into a single batch
+        rows=[]
+        while len(self.pending):
+            levelno,module,msg,s=self.pending.popleft()
+            if self.msgbox and (levelno==logging.ERROR or levelno==logging.CRITICAL):
+                self.showError(module,str(msg))
+            self.messages.append(s)
+            rows.append(s)
+
+        # Add the whole batch to the listbox in one call
+        if len(rows):
+            rows=rows[-self.messages.maxlen:]
+            self.listbox.setUpdatesEnabled(False)
+            while self.listbox.count() and self.listbox.count()+len(rows)>self.messages.maxlen:
+                self.listbox.takeItem(0)
+            self.listbox.addItems(rows)
+            self.listbox.setUpdatesEnabled(True)
             self.listbox.scrollToBottom()
 
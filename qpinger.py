@@ -4,9 +4,142 @@
 # Vegard Fiksdal (C) 2024
 #
 from PyQt6.QtWidgets import QGroupBox,QCheckBox, QPushButton, QHBoxLayout, QVBoxLayout, QLabel, QFrame, QLineEdit, QFileDialog, QComboBox
-from PyQt6.QtCore import Qt,QTimer
+from PyQt6.QtCore import Qt,QTimer,QObject,QThread,pyqtSignal
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-import time,logging,os,socket,ping3,netifaces,json
+from functools import lru_cache
+import time,logging,os,socket,select,struct,json,threading,queue
+import numpy as np
+
+## Prefer orjson for JSON handling when available
+try:
+    import orjson
+except ImportError:
+    orjson=None
+
+##\brief Serializes a configuration as indented JSON to an open file
+# \param config Configuration dictionary to serialize
+# \param fd File object to write to
+def dumpConfig(config,fd):
+    if orjson:
+        fd.write(orjson.dumps(config,option=orjson.OPT_INDENT_2).decode())
+    else:
+        json.dump(config,fd,indent=2)
+
+##\brief Parses a configuration from a JSON string
+# \param data JSON string to parse
+# \return Configuration dictionary
+def loadsConfig(data):
+    if orjson: return orjson.loads(data)
+    return json.loads(data)
+
+##\brief Resolves a hostname to an IP address, caching results
+# \param host Hostname or address to resolve
+# \return Resolved IP address
+@lru_cache(maxsize=256)
+def resolveAddress(host):
+    return socket.gethostbyname(host)
+
+##\brief Calculates the internet checksum of a packet
+# \param data Packet data to checksum
+# \return 16-bit checksum value
+def checksum(data):
+    if len(data)%2: data+=b'\x00'
+    s=sum(struct.unpack('!%dH'%(len(data)//2),data))
+    s=(s>>16)+(s&0xffff)
+    s+=s>>16
+    return (~s)&0xffff
+
+##\brief Pings a batch of addresses through a single ICMP socket
+# \param addresses List of IP addresses to ping
+# \param timeout Timeout in seconds to wait for replies
+# \param sock Socket to ping with (Creates a temporary socket if None)
+# \param cancel Callable returning True to abandon the batch early
+# \return List of roundtrip times in seconds (None for missing replies)
+def batchPing(addresses,timeout,sock=None,cancel=None):
+    temporary=(sock==None)
+    if temporary: sock=socket.socket(socket.AF_INET,socket.SOCK_DGRAM,socket.IPPROTO_ICMP)
+    try:
+        # Discard replies left in the buffer by earlier batches
+        while select.select([sock],[],[],0)[0]:
+            sock.recvfrom(1024)
+
+        # Send an echo request to every address, identified by sequence number
+        sent={}
+        for seq,address in enumerate(addresses):
+            now=time.monotonic()
+            payload=struct.pack('!d',now)
+            header=struct.pack('!BBHHH',8,0,0,0,seq)
+            header=struct.pack('!BBHHH',8,0,checksum(header+payload),0,seq)
+            sock.sendto(header+payload,(address,0))
+            sent[(address,seq)]=now
+
+        # Collect replies until all have arrived or the deadline passes
+        results={}
+        deadline=time.monotonic()+timeout
+        # Select in short slices so a cancelled batch returns promptly
+        while len(results)<len(sent):
+            if cancel and cancel(): break
+            remaining=deadline-time.monotonic()
+            if remaining<=0: break
+            ready,_,_=select.select([sock],[],[],min(remaining,0.2))
+            if not ready: continue
+            data,peer=sock.recvfrom(1024)
+            now=time.monotonic()
+            if len(data)<16: continue
+            type,code,cksum,id,seq=struct.unpack('!BBHHH',data[:8])
+            key=(peer[0],seq)
+            # Only accept replies echoing the timestamp of this batch
+            if type==0 and key not in results and sent.get(key)==struct.unpack('!d',data[8:16])[0]:
+                results[key]=now-sent[key]
+    finally:
+        if temporary: sock.close()
+    return [results.get((address,seq)) for seq,address in enumerate(addresses)]
+
+##\class AsyncFileWriter
+# \brief Writes records to file from a background thread
+class AsyncFileWriter(threading.Thread):
+    ##\brief Opens the output file and starts the writer thread
+    # \param path Path of the file to write
+    def __init__(self,path):
+        super().__init__(daemon=True)
+        self.fd=open(path,'w',buffering=65536)
+        self.q=queue.Queue(maxsize=10000)
+        self.start()
+
+    ##\brief Queues a record for writing
+    # \param record String to write to the file
+    def write(self,record):
+        self.q.put_nowait(record)
+
+    ##\brief Drains the queue and writes records until closed
+    def run(self):
+        unflushed=0
+        while True:
+            record=self.q.get()
+            if record==None: break
+            batch=[record]
+            while len(batch)<64:
+                try:
+                    record=self.q.get_nowait()
+                except queue.Empty:
+                    break
+                if record==None:
+                    self.fd.writelines(batch)
+                    self.fd.close()
+                    return
+                batch.append(record)
+            self.fd.writelines(batch)
+            unflushed+=len(batch)
+            if unflushed>=16:
+                self.fd.flush()
+                unflushed=0
+        self.fd.close()
+
+    ##\brief Flushes remaining records and closes the file
+    def close(self):
+        self.q.put(None)
+        self.join()
 
 ##\class ConfigBox
 # \brief Class to display a label + edit control for simple configuration
@@ -120,6 +253,7 @@ class PingItems(QFrame):
         self.ilayout.setContentsMargins(0,0,0,0)
         self.setLayout(self.ilayout)
         self.items=[]
+        self.buttons={}
 
     ##\brief Counts the number of items
     # \return Number of items loaded
@@ -129,18 +263,18 @@ class PingItems(QFrame):
     ##\brief Remove all items
     def clear(self):
         for item in self.items:
-            self.remItem(item)
-            self.clear()
+            self.ilayout.removeWidget(item)
+            item.deleteLater()
+        self.items=[]
+        self.buttons={}
 
     ##\brief Find an item from the pressed button object
     # \param button The button object that issued the original event
     # \return PingItemBox instance associated with the button, or None upon failure
     def findItem(self,button):
-        for item in self.items:
-            if item.button==button:
-                return item
-        return None
-    
+        return self.buttons.get(id(button))
+
+
     ##\brief Parse an item into address and channels
     # \param index Index of the item to parse
     # \return address, ultrasound channel, temperature channel as tuple
@@ -154,17 +288,176 @@ class PingItems(QFrame):
     # \param item Object to add
     def addItem(self,item):
         self.items.append(item)
+        self.buttons[id(item.button)]=item
         self.ilayout.addWidget(item)
 
+    ##\brief Add several PingItemBox instances in a single layout pass
+    # \param items List of objects to add
+    def bulkAdd(self,items):
+        self.setUpdatesEnabled(False)
+        for item in items:
+            self.addItem(item)
+        self.setUpdatesEnabled(True)
+        self.updateGeometry()
+
     ##\brief Remove a PingItemBox instance
     # \param item Object to remove
     def remItem(self,item):
         self.items.remove(item)
+        self.buttons.pop(id(item.button),None)
         self.ilayout.removeWidget(item)
 
+##\class PingWorker
+# \brief Executes scheduled pings on a background thread
+class PingWorker(QObject):
+    ## Signal emitted with xdata, ydata and legend after each sample batch
+    sampleReady=pyqtSignal(object,object,object)
+
+    ##\brief Configures the worker
+    # \param targets List of name,address tuples to ping
+    # \param interval Pinging interval in seconds
+    # \param nsamples Number of samples to keep in the ring buffers
+    # \param filtertk Number of samples to average results over
+    # \param writer AsyncFileWriter for CSV output (Can be None)
+    def __init__(self,targets,interval,nsamples,filtertk,writer):
+        super().__init__()
+        self.targets=targets
+        self.interval=interval
+        self.nsamples=nsamples
+        self.filtertk=filtertk
+        self.writer=writer
+        self.addresses=[address for name,address in targets]
+        self.legend=[name+' ['+address+']' for name,address in targets]
+        self.xdata=np.zeros(nsamples,dtype=np.float64)
+        self.ydata=np.full((len(targets),nsamples),np.nan,dtype=np.float32)
+        self.head=0
+        self.filled=0
+        self.filteracc=np.zeros(len(targets),dtype=np.float32)
+        self.initialized=np.zeros(len(targets),dtype=bool)
+        self.executor=ThreadPoolExecutor(max_workers=max(1,len(targets)))
+        self.sock=None
+        self.running=True
+
+        # Prefer icmplib for batched pinging through a single socket
+        try:
+            from icmplib import multiping
+            self.multiping=multiping
+        except ImportError:
+            self.multiping=None
+
+    ##\brief Starts the scheduling timers on the worker thread
+    def start(self):
+        # Open one unprivileged ICMP socket to reuse across all samples
+        if self.multiping==None:
+            try:
+                self.sock=socket.socket(socket.AF_INET,socket.SOCK_DGRAM,socket.IPPROTO_ICMP)
+            except OSError:
+                self.sock=None
+
+        # Sample immediately, then align a periodic timer to the interval
+        self.timer=QTimer(self)
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.timer.timeout.connect(self.sample)
+        QTimer.singleShot(0,self.sample)
+        delay=self.interval-(time.monotonic()%self.interval)
+        QTimer.singleShot(int(delay*1000),self.begin)
+
+    ##\brief Runs the first aligned sample and starts periodic scheduling
+    def begin(self):
+        if not self.running: return
+        # Start the timer first so a blocking sample cannot shift the phase
+        self.timer.start(int(self.interval*1000))
+        self.sample()
+
+    ##\brief Stops the worker
+    def stop(self):
+        self.running=False
+
+    ##\brief Releases the reusable ICMP socket and the ping thread pool
+    #
+    # Only call this once the worker thread has finished, as closing the
+    # socket does not wake a select() blocked on it.
+    def cleanup(self):
+        self.executor.shutdown(wait=False)
+        if self.sock!=None:
+            self.sock.close()
+            self.sock=None
+
+    ##\brief Pings all targets and publishes the results
+    def sample(self):
+        if not self.running: return
+
+        # Execute all requests as a single batch, or concurrently as fallback
+        if self.multiping!=None:
+            hosts=self.multiping(self.addresses,count=1,timeout=self.interval*0.9,privileged=False)
+            rtt={host.address:host.avg_rtt/1000 for host in hosts if host.is_alive}
+            results=[rtt.get(address) for address in self.addresses]
+        else:
+            try:
+                results=batchPing(self.addresses,self.interval*0.9,self.sock,cancel=lambda: not self.running)
+            except OSError:
+                if not self.running: return
+                import ping3
+                results=list(self.executor.map(lambda address: ping3.ping(address,timeout=self.interval*0.9),self.addresses))
+        if not self.running: return
+
+        # Filter all targets in one vectorized pass
+        raw=np.array([result*1000 if isinstance(result,float) else np.nan for result in results],dtype=np.float32)
+        valid=~np.isnan(raw)
+        filtered=raw
+        if self.filtertk>1:
+            filtered=np.where(self.initialized,(self.filteracc*(self.filtertk-1)+raw)/self.filtertk,raw)
+        self.filteracc=np.where(valid,filtered,self.filteracc)
+        self.initialized|=valid
+
+        # Register values
+        now=datetime.now()
+        csv=[str(now)]
+        values=np.where(valid,filtered,np.nan)
+        self.xdata[self.head]=now.timestamp()
+        self.ydata[:,self.head]=values
+        for (name,address),result,value in zip(self.targets,results,values):
+            if result==None:
+                logging.info('%s: Reply from %s timed out',name,address)
+                csv.append('No reply')
+            elif result==False:
+                logging.info('%s: Could not resolve %s',name,address)
+                csv.append('Cannot resolve')
+            else:
+                logging.debug('%s: %s %.3fms',name,address,value)
+                csv.append(f'{value:.3f}')
+        self.head=(self.head+1)%self.nsamples
+        if self.filled<self.nsamples: self.filled+=1
+
+        # Update CSV file
+        if self.writer!=None:
+            self.writer.write(','.join(csv)+'\n')
+
+        # Publish new data
+        xdata,ydata=self.plotData()
+        self.sampleReady.emit(xdata,ydata,self.legend)
+
+    ##\brief Orders the ring buffers chronologically for plotting
+    # \return xdata and ydata arrays as tuple
+    def plotData(self):
+        # Hand out views while filling, where writes land outside the slice
+        if self.filled<self.nsamples:
+            return self.xdata[:self.filled],self.ydata[:,:self.filled]
+        # Once the ring wraps the next tick overwrites emitted indexes, so
+        # the GUI thread must get its own copy
+        if self.head==0:
+            return self.xdata.copy(),self.ydata.copy()
+        xdata=np.roll(self.xdata,-self.head)[-self.filled:]
+        ydata=np.roll(self.ydata,-self.head,axis=1)[:,-self.filled:]
+        return xdata,ydata
+
 ##\class QPinger
 # \brief Frame to present the logging options visually
 class QPinger(QFrame):
+    ## Signal emitted with xdata, ydata and legend after each sample batch
+    sampleReady=pyqtSignal(object,object,object)
+    ## Signal emitted when the user selects another plot style
+    styleUpdated=pyqtSignal(str)
     ##\brief Constructor sets layout and creates necessary objects
     # \param Label Name of the frame
     def __init__(self,):
@@ -173,8 +466,8 @@ class QPinger(QFrame):
         layout=QVBoxLayout()
         pinglayout=QVBoxLayout()
         ctrllayout=QHBoxLayout()
-        self.xdata=[]
-        self.ydata=[]
+        self.xdata=None
+        self.ydata=None
         self.legend=[]
         self.dataflag=False
 
@@ -231,31 +524,46 @@ class QPinger(QFrame):
         self.ctrl_style.combo.addItem('classic')
         self.ctrl_style.combo.addItem('dark_background')
         self.ctrl_style.combo.setCurrentIndex(self.ctrl_style.combo.count()-1)
+        self.ctrl_style.combo.currentTextChanged.connect(self.styleChanged)
+        self.mplstyle=self.ctrl_style.combo.currentText()
+
+        # Wrap editable controls in a single frame to enable/disable as one
+        elayout=QVBoxLayout()
+        elayout.addLayout(pinglayout,1)
+        elayout.addLayout(ctrllayout)
+        elayout.setContentsMargins(0,0,0,0)
+        self.editframe=QFrame()
+        self.editframe.setLayout(elayout)
 
         # Wrap up dialog
-        layout.addLayout(pinglayout,1)
-        layout.addLayout(ctrllayout)
+        layout.addWidget(self.editframe,1)
         layout.addWidget(self.ctrl_start)
         layout.addWidget(self.ctrl_stop)
         layout.setContentsMargins(0,0,0,0)
         self.setLayout(layout)
 
         # Add some default reference targets
-        gw=netifaces.gateways()
-        if 'default' in gw: self.addTarget('Gateway',gw['default'][netifaces.AF_INET][0])
+        try:
+            import netifaces
+            gw=netifaces.gateways()
+            if 'default' in gw: self.addTarget('Gateway',gw['default'][netifaces.AF_INET][0])
+        except ImportError:
+            pass
         self.addTarget('Google','google.com')
 
         # Some simple runtime variables
         self.running=False
-        self.next=0
-        self.fd=None
+        self.writer=None
+        self.worker=None
+        self.thread=None
+        self.parked=[]
         self.stopPinging()
 
     def loadConfig(self,filename):
         if len(filename)==0: return
         with open(filename,'r') as fd:
             config=fd.read()
-        config=json.loads(config)
+        config=loadsConfig(config)
         try:
             self.ctrl_interval.edit.setText(str(config['settings']['interval']))
             self.ctrl_filtertk.edit.setText(str(config['settings']['filtertk']))
@@ -263,10 +571,26 @@ class QPinger(QFrame):
             self.ctrl_path.edit.setText(str(config['settings']['path']))
             self.ctrl_style.combo.setCurrentIndex(config['settings']['style'])
             self.cfg_items.clear()
-            for target in config['targets']:
-                self.addTarget(target[0],target[1])
+
+            # Warm the resolver cache for all targets in parallel
+            def warm(host):
+                try:
+                    resolveAddress(host)
+                except OSError:
+                    pass
+            with ThreadPoolExecutor(max_workers=8) as ex:
+                list(ex.map(warm,[target[1] for target in config['targets']]))
+
+            # Build all items up front and add them in one layout pass
+            items=[]
+            for name,address in config['targets']:
+                try:
+                    items.append(self.makeItem(name,resolveAddress(address)))
+                except OSError as e:
+                    logging.error('Invalid address: %s',e)
+            self.cfg_items.bulkAdd(items)
         except Exception as e:
-            logging.error('Failed to read configuration: '+str(e))
+            logging.error('Failed to read configuration: %s',e)
 
     def saveConfig(self,filename):
         if len(filename)==0: return
@@ -278,12 +602,16 @@ class QPinger(QFrame):
         config['settings']['path']=self.ctrl_path.edit.text()
         config['settings']['style']=self.ctrl_style.combo.currentIndex()
         config['targets']=[]
-        for index in range(len(self.cfg_items.items)):
-            name,address=self.cfg_items.parseItem(index)
-            config['targets'].append([name,address])
-        config=json.dumps(config,indent=4)
-        with open(filename,'w') as fd:
-            fd.write(config)
+        for item in self.cfg_items.items:
+            config['targets'].append([item.name.text(),item.address.text()])
+        with open(filename,'w',buffering=65536) as fd:
+            dumpConfig(config,fd)
+
+    ##\brief Caches the selected plot style
+    # \param style Name of the selected style
+    def styleChanged(self,style):
+        self.mplstyle=style
+        self.styleUpdated.emit(style)
 
     ##\brief Set name to address if empty
     def addressChanged(self):
@@ -295,64 +623,54 @@ class QPinger(QFrame):
         if self.cfg_newitem.address.text()=='':
             self.cfg_newitem.address.setText(self.cfg_newitem.name.text())
 
-    ##\brief Calculates next pinging slot
-    # \return Next pinging slot in seconds
-    def nextTimeout(self):
-        now=time.time()
-        return now+(self.interval-(now%self.interval))
-    
-    ##\brief Timer event to poll for next scheduled pinging
-    def updatePing(self):
-        if self.running and time.time()>=self.next:
-            # Execute requests
-            self.next=self.nextTimeout()
-            for i in range(self.cfg_items.count()):
-                item=self.cfg_items.items[i]
-                item.result=ping3.ping(item.address.text())
-
-            # Register values
-            csv=str(datetime.now())
-            self.xdata.append(datetime.now())
-            while len(self.xdata)>self.nsamples: self.xdata=self.xdata[1:]
-            for index in range(len(self.cfg_items.items)):
-                item=self.cfg_items.items[index]
-                result=item.result
-                self.ydata[index].append(float('nan'))
-                while len(self.ydata[index])>self.nsamples: self.ydata[index]=self.ydata[index][1:]
-                if result==None:
-                    logging.info(item.name.text()+': Reply from '+item.address.text()+' timed out')
-                    csv+=',No reply'
-                elif result==False:
-                    logging.info(item.name.text()+': Could not resolve '+item.address.text())
-                    csv+=',Cannot resolve'
-                else:
-                    result*=1000
-                    if self.filteracc[index]==0: self.filteracc[index]=result
-                    if self.filtertk>1: result=(self.filteracc[index]*(self.filtertk-1)+result)/self.filtertk
-                    logging.debug(item.name.text()+': '+item.address.text()+' '+str(result)+'ms')
-                    csv+=','+str(result)
-                    self.ydata[index][-1]=result
-
-            # Update CSV file
-            if self.fd!=None:
-                self.fd.write(csv+'\n')
-                self.fd.flush()
-
-            # Flag new data
-            return self.xdata,self.ydata,self.legend
-
-        # No new data
-        return None,None,None
-
-    ##\brief Stops timer and resets dialog
+    ##\brief Receives a sample batch from the worker
+    # \param xdata Dataset for x-axis
+    # \param ydata Dataset for y-axis
+    # \param legend List of legend entries
+    def handleSample(self,xdata,ydata,legend):
+        self.xdata=xdata
+        self.ydata=ydata
+        self.legend=legend
+        self.sampleReady.emit(xdata,ydata,legend)
+
+    ##\brief Stops worker thread and resets dialog
     def stopPinging(self):
         self.running=False
-        self.cfg_group.setEnabled(True)
+        if self.worker!=None:
+            self.worker.stop()
+            self.thread.quit()
+            if self.thread.wait(2000):
+                self.worker.cleanup()
+            else:
+                # Park the references until the thread drains - destroying
+                # a running QThread aborts the application
+                self.parked.append((self.thread,self.worker))
+                self.thread.finished.connect(self.reapThreads)
+            self.worker=None
+            self.thread=None
+        self.editframe.setEnabled(True)
         self.ctrl_start.setEnabled(True)
         self.ctrl_stop.setEnabled(False)
-        self.ctrl_group.setEnabled(True)
-        if self.fd!=None: self.fd.close()
-        self.fd=None
+        if self.writer!=None: self.writer.close()
+        self.writer=None
+
+    ##\brief Stops pinging and waits out any parked worker threads
+    #
+    # Call before application exit - a QThread destroyed while still
+    # running aborts the process.
+    def shutdown(self):
+        self.stopPinging()
+        for thread,worker in self.parked:
+            thread.quit()
+            thread.wait()
+            worker.cleanup()
+        self.parked=[]
+
+    ##\brief Releases parked workers whose threads have since finished
+    def reapThreads(self):
+        for thread,worker in self.parked:
+            if thread.isFinished(): worker.cleanup()
+        self.parked=[(thread,worker) for thread,worker in self.parked if not thread.isFinished()]
 
     ##\brief Starts timer and initiates log files
     def startPinging(self):
@@ -366,9 +684,9 @@ class QPinger(QFrame):
         if self.interval<=0:
             logging.error('Interval must be a numeric value greater than zero')
             return
-        self.nsamples=self.ctrl_nsamples.GetValue(-1)
-        if self.nsamples<0:
-            logging.error('Number of samples must be a numeric value')
+        self.nsamples=int(self.ctrl_nsamples.GetValue(-1))
+        if self.nsamples<=0:
+            logging.error('Number of samples must be a numeric value greater than zero')
             return
         self.filtertk=self.ctrl_filtertk.GetValue(-1)
         if self.filtertk<0:
@@ -382,34 +700,46 @@ class QPinger(QFrame):
             filename=datetime.now().strftime('PingTrend - %Y%m%d %H%M%S')+'.csv'
             path=folder+filename
             try:
-                self.fd = open(path,'w')
-                csv='Time'
-                for index in range(len(self.cfg_items.items)):
-                    name,address=self.cfg_items.parseItem(index)
-                    csv+=','+name
-                self.fd.write(csv+'\n')
+                self.writer=AsyncFileWriter(path)
+                csv=['Time']
+                for item in self.cfg_items.items:
+                    csv.append(item.name.text())
+                self.writer.write(','.join(csv)+'\n')
             except:
-                logging.error('Could not open file for writing in '+path)
+                logging.error('Could not open file for writing in %s',path)
                 return
 
-        # Unset dataseries
-        self.xdata=[]
-        self.ydata=[]
+        # Snapshot targets and launch the worker thread
+        self.xdata=None
+        self.ydata=None
         self.legend=[]
-        self.filteracc=[]
-        for i in range(len(self.cfg_items.items)):
-            name,address=self.cfg_items.parseItem(i)
-            self.ydata.append([])
-            self.filteracc.append(0.0)
-            self.legend.append(name+' ['+address+']')
+        targets=[(item.name.text(),item.address.text()) for item in self.cfg_items.items]
+        self.worker=PingWorker(targets,self.interval,self.nsamples,self.filtertk,self.writer)
+        self.worker.sampleReady.connect(self.handleSample)
+        self.thread=QThread()
+        self.worker.moveToThread(self.thread)
+        self.thread.started.connect(self.worker.start)
+        self.thread.start()
 
         # Set UI state
-        self.cfg_group.setEnabled(False)
+        self.editframe.setEnabled(False)
         self.ctrl_start.setEnabled(False)
         self.ctrl_stop.setEnabled(True)
-        self.ctrl_group.setEnabled(False)
         self.running=True
-        self.next=0
+
+    ##\brief Builds a locked PingItemBox for a validated target
+    # \param name Name of ping target
+    # \param address Address of ping target
+    # \return Configured PingItemBox instance
+    def makeItem(self,name,address):
+        newitem=PingItemBox()
+        newitem.name.setText(name)
+        newitem.address.setText(address)
+        newitem.name.setEnabled(False)
+        newitem.address.setEnabled(False)
+        newitem.button.setText('Remove')
+        newitem.button.clicked.connect(self.remItem)
+        return newitem
 
     ##\brief Adds an target to be logged
     # \param name Name of ping target
@@ -433,21 +763,14 @@ class QPinger(QFrame):
             logging.error('No address given!')
             return
         try:
-            address=socket.gethostbyname(self.cfg_newitem.address.text())
+            address=resolveAddress(self.cfg_newitem.address.text())
             self.cfg_newitem.address.setText(address)
         except Exception as e:
-            logging.error('Invalid address: '+str(e))
+            logging.error('Invalid address: %s',e)
             return
         
         # Create a new item with the current settings
-        newitem=PingItemBox()
-        newitem.name.setText(self.cfg_newitem.name.text())
-        newitem.address.setText(self.cfg_newitem.address.text())
-        newitem.name.setEnabled(False)
-        newitem.address.setEnabled(False)
-        newitem.button.setText('Remove')
-        newitem.button.clicked.connect(self.remItem)
-        self.cfg_items.addItem(newitem)
+        self.cfg_items.addItem(self.makeItem(self.cfg_newitem.name.text(),self.cfg_newitem.address.text()))
 
         # Clear configuration item
         self.cfg_newitem.name.setText('')
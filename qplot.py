@@ -8,8 +8,6 @@
 from PyQt6.QtWidgets import QFrame, QHBoxLayout
 from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
-from mplcursors import cursor
-import matplotlib.pyplot as plt
 import logging
 
 ##\class QPlot
@@ -28,6 +26,9 @@ class QPlot(FigureCanvas):
         self.axes = fig.add_subplot(111)
         self.axes.format_coord=lambda x,y: f"x={x:.4f}, y={y:.4f}"
         fig.set_tight_layout(True)
+        self.lines=[]
+        self.background=None
+        self.suppressdraw=False
         self.setData([],[],None,None,None)
         self.title=title
         self.xtitle=xtitle
@@ -55,20 +56,28 @@ class QPlot(FigureCanvas):
 
     ##\brief Renders a plot of the current dataset
     # \param renderer Plot object to render with
+    # \return List of rendered dataseries lines
     def renderPlot(self,renderer):
         renderer.ticklabel_format(style='plain',useOffset=False,axis='both')
+        lines=[]
         if self.legend:
-            [renderer.plot(self.xdata,self.ydata[i],label=self.legend[i]) for i in range(len(self.ydata))]
+            for y,label in zip(self.ydata,self.legend):
+                lines.append(renderer.plot(self.xdata,y,label=label)[0])
             renderer.legend(loc='upper right')
         else:
-            [renderer.plot(self.xdata,self.ydata[i]) for i in range(len(self.ydata))]
-        if self.vlines: [renderer.axvline(l,color='red',linestyle='--',linewidth=1) for l in self.vlines]
-        if self.hlines: [renderer.axhline(l,color='red',linestyle='--',linewidth=1) for l in self.hlines]
+            for y in self.ydata:
+                lines.append(renderer.plot(self.xdata,y)[0])
+        if self.vlines:
+            for l in self.vlines: renderer.axvline(l,color='red',linestyle='--',linewidth=1)
+        if self.hlines:
+            for l in self.hlines: renderer.axhline(l,color='red',linestyle='--',linewidth=1)
         if self.grid:   renderer.grid()
+        return lines
 
     ##\brief Handles doubleclicks to plot current dataset in another window
     # \param event Not used
     def mouseDoubleClickEvent(self,event):
+        import matplotlib.pyplot as plt
         try:
             plt.ion()
             self.renderPlot(plt)
@@ -77,7 +86,7 @@ class QPlot(FigureCanvas):
             if len(self.ytitle): plt.ylabel(self.ytitle)
             plt.show()
         except Exception as e:
-            logging.error('Failed to open interactive plot: '+str(e))
+            logging.error('Failed to open interactive plot: %s',e)
             plt.ioff()
 
     ##\brief Plots a dataset using Y-axis data
@@ -96,9 +105,10 @@ class QPlot(FigureCanvas):
     # \param hlines List of horizontal lines (Can be None)
     # \param vlines List of vertical lines (Can be None)
     def plotXY(self,xdata,ydata,legend=None,hlines=None,vlines=None):
+        from mplcursors import cursor
         self.setData(xdata,ydata,legend,hlines,vlines)
         self.axes.clear()
-        self.renderPlot(self.axes)
+        self.lines=self.renderPlot(self.axes)
         self.cursor=cursor(self.axes.get_lines(),hover=2)
         if self.xlimit!=None: self.axes.set_xlim(self.xlimit)
         if self.ylimit!=None: self.axes.set_ylim(self.ylimit)
@@ -108,13 +118,67 @@ class QPlot(FigureCanvas):
         if len(self.xtitle): self.axes.set_xlabel(self.xtitle)
         if len(self.ytitle): self.axes.set_ylabel(self.ytitle)
         try:
-            self.draw()
+            if not self.suppressdraw: self.refresh()
         except Exception as error:
-            logging.warning('Exception occurred while plotting: '+str(error))
+            logging.warning('Exception occurred while plotting: %s',error)
+
+    ##\brief Updates an existing plot with new data, blitting only the dataseries
+    # \param xdata Dataset for x-axis
+    # \param ydata Dataset for y-axis
+    # \param legend List of legend entries (Can be None)
+    # \param hlines List of horizontal lines (Can be None)
+    # \param vlines List of vertical lines (Can be None)
+    def updateXY(self,xdata,ydata,legend=None,hlines=None,vlines=None):
+        # Fall back to a full plot if the series layout has changed
+        if self.background==None or len(self.lines)!=len(ydata):
+            self.plotXY(xdata,ydata,legend,hlines,vlines)
+            return
+        self.setData(xdata,ydata,legend,hlines,vlines)
+        for line,y in zip(self.lines,ydata):
+            line.set_data(xdata,y)
+
+        # Redraw fully if autoscaling moved the axis bounds, otherwise blit
+        xlim=self.axes.get_xlim()
+        ylim=self.axes.get_ylim()
+        if self.xlimit==None or self.ylimit==None:
+            self.axes.relim()
+            self.axes.autoscale_view()
+        if xlim!=self.axes.get_xlim() or ylim!=self.axes.get_ylim():
+            # Redraw decorations around the existing lines without clearing the axes
+            try:
+                if not self.suppressdraw: self.refresh()
+            except Exception as error:
+                logging.warning('Exception occurred while plotting: %s',error)
+        elif not self.suppressdraw:
+            try:
+                self.restore_region(self.background)
+                for line in self.lines: self.axes.draw_artist(line)
+                self.blit(self.axes.bbox)
+            except Exception as error:
+                logging.warning('Exception occurred while plotting: %s',error)
+
+    ##\brief Recaptures the blitting background when the canvas is resized
+    # \param event Resize event to forward
+    def resizeEvent(self,event):
+        super().resizeEvent(event)
+        try:
+            self.refresh()
+        except Exception:
+            self.background=None
+
+    ##\brief Redraws the static plot content and recaptures the blitting background
+    def refresh(self):
+        for line in self.lines: line.set_animated(True)
+        self.draw()
+        self.background=self.copy_from_bbox(self.axes.bbox)
+        for line in self.lines: self.axes.draw_artist(line)
+        self.blit(self.axes.bbox)
 
     ##\brief Clear plot
     def clear(self):
         self.setData([],[],None,None,None)
+        self.lines=[]
+        self.background=None
         self.axes.clear()
 
 ##\class QStyledPlot
@@ -131,25 +195,25 @@ class QStyledPlot(QFrame):
     # \param mplstyle Matplotlib style to apply
     def __init__(self,title='',xtitle='',ytitle='',grid=False,xfmt=None,yfmt=None,xlimit=None,ylimit=None,mplstyle='default'):
         super().__init__()
+        import matplotlib.pyplot as plt
         plt.style.use(mplstyle)
         self.mplstyle=mplstyle
-        self.plot=QPlot(title,xtitle,ytitle,xfmt,yfmt,xlimit,ylimit)
+        self.plot=QPlot(title,xtitle,ytitle,grid,xfmt,yfmt,xlimit,ylimit)
         self.wlayout=QHBoxLayout()
         self.wlayout.addWidget(self.plot,1)
         self.wlayout.setContentsMargins(0,0,0,0)
         self.setLayout(self.wlayout)
 
+    ##\brief Applies a new style to the existing plot
+    # \param mplstyle Matplotlib style to apply
     def setStyle(self,mplstyle):
-        # Load new plot
+        # Apply style and replay the current dataset on the existing canvas
+        import matplotlib.pyplot as plt
         plt.style.use(mplstyle)
         self.mplstyle=mplstyle
-        p=self.plot
-        p=QPlot(p.title,p.xtitle,p.ytitle,p.xfmt,p.yfmt,p.xlimit,p.ylimit)
-
-        # Switch plots in layout
-        self.wlayout.removeWidget(self.plot)
-        self.wlayout.addWidget(p,1)
-        self.plot=p
+        self.plot.figure.set_facecolor(plt.rcParams['figure.facecolor'])
+        self.plot.axes.set_facecolor(plt.rcParams['axes.facecolor'])
+        self.plot.plotXY(self.plot.xdata,self.plot.ydata,self.plot.legend,self.plot.hlines,self.plot.vlines)
 
     ##\brief Registers current dataset for export
     # \param xdata Dataset for x-axis
@@ -188,6 +252,38 @@ class QStyledPlot(QFrame):
     def plotXY(self,xdata,ydata,legend=None,hlines=None,vlines=None):
         self.plot.plotXY(xdata,ydata,legend,hlines,vlines)
 
+    ##\brief Updates an existing plot with new data, blitting only the dataseries
+    # \param xdata Dataset for x-axis
+    # \param ydata Dataset for y-axis
+    # \param legend List of legend entries (Can be None)
+    # \param hlines List of horizontal lines (Can be None)
+    # \param vlines List of vertical lines (Can be None)
+    def updateXY(self,xdata,ydata,legend=None,hlines=None,vlines=None):
+        self.plot.updateXY(xdata,ydata,legend,hlines,vlines)
+
     ##\brief Clear plot
     def clear(self):
         self.plot.clear()
+
+##\class PlotUpdateGuard
+# \brief Context manager to coalesce several plot changes into a single redraw
+class PlotUpdateGuard():
+    ##\brief Configures the guard
+    # \param plot QStyledPlot or QPlot instance to guard
+    def __init__(self,plot):
+        self.plot=plot
+
+    ##\brief Suppresses intermediate redraws
+    def __enter__(self):
+        getattr(self.plot,'plot',self.plot).suppressdraw=True
+        return self.plot
+
+    ##\brief Re-enables drawing and performs a single redraw
+    def __exit__(self,type,value,traceback):
+        plot=getattr(self.plot,'plot',self.plot)
+        plot.suppressdraw=False
+        try:
+            plot.refresh()
+        except Exception as error:
+            logging.warning('Exception occurred while plotting: %s',error)
+        return False